@@ -0,0 +1,48 @@
+# On-disk cache of final tutor outputs, so re-running the demo doesn't pay for
+# the same Gemini calls again. Set AITEST_CACHE=0 to bypass it.
+
+import hashlib
+import json
+import os
+import pathlib
+from dataclasses import dataclass
+
+from agents import Agent
+
+CACHE_DIR = pathlib.Path("~/.ai_test/cache").expanduser()
+
+@dataclass(frozen=True)
+class CachedResult:
+    """Stands in for a RunResult served from the cache."""
+    final_output: str
+    last_agent: Agent
+
+def enabled() -> bool:
+    return os.environ.get("AITEST_CACHE") != "0"
+
+def key(model: str, agent_name: str, prompt: str, instr: str) -> str:
+    """Content address of a run: changing any of its inputs misses the cache."""
+    return hashlib.sha256(f"{model}|{agent_name}|{prompt}|{instr}".encode()).hexdigest()
+
+def load(cache_key: str) -> str | None:
+    """Returns the cached final output, or None on a miss or unreadable entry."""
+    try:
+        data = json.loads((CACHE_DIR / f"{cache_key}.json").read_text())
+    except (OSError, ValueError):
+        return None
+    # Anything but {"final_output": "<text>"} is a corrupt entry, i.e. a miss
+    if not isinstance(data, dict) or not isinstance(data.get("final_output"), str):
+        return None
+    return data["final_output"]
+
+def store(cache_key: str, final_output: str) -> None:
+    """Writes the entry atomically, so a concurrent reader never sees half a file."""
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = CACHE_DIR / f"{cache_key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_text(json.dumps({"final_output": final_output}))
+        tmp.replace(path)
+    except OSError:
+        # The cache is only an optimisation
+        pass
@@ -0,0 +1,57 @@
+import functools
+import logging
+import os
+from contextlib import suppress
+
+import httpx
+from dotenv import load_dotenv
+from agents import AsyncOpenAI
+
+# --- Shared Gemini Client ---
+
+BASE_URL = "https://generativelanguage.googleapis.com/v1beta/openai/"
+
+logger = logging.getLogger(__name__)
+
+@functools.lru_cache(maxsize=1)
+def _api_key() -> str:
+    """Reads GEMINI_API_KEY, loading .env the first time it's needed."""
+    load_dotenv()
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+    return api_key
+
+async def _log_http_version(response: httpx.Response) -> None:
+    """Debug-logs the negotiated protocol, to confirm requests go over HTTP/2."""
+    logger.debug("%s %s -> %s", response.request.method, response.request.url, response.http_version)
+
+@functools.lru_cache(maxsize=1)
+def get_client() -> AsyncOpenAI:
+    """The one client every entrypoint shares, built on first use."""
+    # Keep connections to Gemini alive between calls so only the first request
+    # pays for the TCP + TLS handshake. HTTP/2 lets concurrent runs multiplex
+    # over a single socket instead of opening one connection each.
+    limits = httpx.Limits(
+        max_keepalive_connections=64,
+        max_connections=128,
+        keepalive_expiry=85.0,
+    )
+
+    http_client = httpx.AsyncClient(
+        limits=limits,
+        http2=True,
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        event_hooks={"response": [_log_http_version]},
+    )
+
+    return AsyncOpenAI(
+        api_key=_api_key(),
+        base_url=BASE_URL,
+        http_client=http_client,
+    )
+
+async def warm_up() -> None:
+    """Opens a pooled connection to Gemini with a cheap request; failures are ignored."""
+    with suppress(Exception):
+        await get_client().with_options(timeout=2.0).models.list()
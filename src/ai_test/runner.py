@@ -0,0 +1,157 @@
+# Wrapper around Runner.run used for every agent run in this package
+
+import asyncio
+import contextlib
+import contextvars
+import os
+import weakref
+from dataclasses import dataclass
+
+from agents import Agent, Runner, RunResult
+
+from . import cache
+
+try:
+    from aiolimiter import AsyncLimiter
+except ImportError:
+    AsyncLimiter = None
+
+def _positive_env(name: str, default: str | None, cast):
+    """Reads a numeric setting from the environment, insisting it's at least 1."""
+    raw = os.environ.get(name, default)
+    try:
+        value = cast(raw)
+    except (TypeError, ValueError):
+        value = None
+    if value is None or value < 1:
+        raise ValueError(f"{name} must be a number >= 1, got {raw!r}")
+    return value
+
+@dataclass
+class _Limits:
+    semaphore: asyncio.Semaphore
+    limiter: "AsyncLimiter | None"
+
+# One set of limits per event loop: asyncio primitives bind to the first loop
+# that waits on them, so sharing them would break a second asyncio.run().
+_LIMITS: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _Limits] = weakref.WeakKeyDictionary()
+
+def _limits() -> _Limits:
+    """
+    The limits for the running loop, read from the environment the first time
+    the loop needs them: AITEST_MAX_CONC (default 8) permits and, when
+    aiolimiter is installed and AITEST_QPM is set, a per-minute limiter.
+    """
+    loop = asyncio.get_running_loop()
+    limits = _LIMITS.get(loop)
+    if limits is None:
+        limiter = None
+        if os.environ.get("AITEST_QPM") and AsyncLimiter is not None:
+            limiter = AsyncLimiter(_positive_env("AITEST_QPM", None, float), 60)
+        limits = _Limits(asyncio.Semaphore(_positive_env("AITEST_MAX_CONC", "8", int)), limiter)
+        _LIMITS[loop] = limits
+    return limits
+
+# What the cap counts: top-level agent runs in flight on the loop. Runs
+# started from inside a run that holds a permit (an input guardrail, or a
+# coalesced run created there) share that permit instead of taking their
+# own, because waiting for a second one could deadlock once every permit is
+# taken. Callers that join a coalesced run don't take one either. A single
+# run may still make several Gemini requests one after another (handoffs,
+# tool turns), so AITEST_MAX_CONC bounds concurrent runs, not HTTP requests,
+# and AITEST_QPM likewise paces the starts of runs.
+_HOLDS_PERMIT = contextvars.ContextVar("holds_permit", default=False)
+
+@contextlib.asynccontextmanager
+async def _permit():
+    if _HOLDS_PERMIT.get():
+        yield
+        return
+    limits = _limits()
+    async with limits.semaphore:
+        if limits.limiter is not None:
+            await limits.limiter.acquire()
+        token = _HOLDS_PERMIT.set(True)
+        try:
+            yield
+        finally:
+            _HOLDS_PERMIT.reset(token)
+
+async def bounded_run(agent: Agent, prompt: str, **kwargs) -> RunResult:
+    """Runner.run, holding one of the AITEST_MAX_CONC permits (see _HOLDS_PERMIT)."""
+    async with _permit():
+        return await Runner.run(agent, prompt, **kwargs)
+
+@dataclass
+class _InFlight:
+    """A shared run and the number of callers currently awaiting it."""
+    task: asyncio.Task[RunResult]
+    waiters: int = 0
+
+# Runs currently in flight, keyed by _inflight_key()
+_INFLIGHT: dict[tuple, _InFlight] = {}
+
+def _inflight_key(agent: Agent, prompt: str, kwargs: dict) -> tuple:
+    """
+    Identifies runs that are interchangeable: the same agent object (clones
+    share a name but not guardrails), the same prompt, and the same objects
+    for run_config, context and every other argument.
+    """
+    return (id(agent), prompt, tuple(sorted((name, id(value)) for name, value in kwargs.items())))
+
+def _cache_key(agent: Agent, prompt: str, run_config) -> str | None:
+    """Disk cache key for the run, or None if its result can't be cached."""
+    # Only plain-text answers from agents that never hand off (the tutors)
+    # can be rebuilt from the cache. Guarded agents are skipped, since the
+    # key can't tell them apart from an unguarded clone of the same name.
+    if not cache.enabled() or run_config is None:
+        return None
+    if agent.output_type is not None or agent.handoffs or agent.input_guardrails:
+        return None
+    if not isinstance(agent.instructions, str):
+        return None
+    model = getattr(run_config.model, "model", run_config.model)
+    return cache.key(str(model), agent.name, prompt, agent.instructions)
+
+async def run_agent(agent: Agent, prompt: str, **kwargs) -> RunResult | cache.CachedResult:
+    """
+    Runs the agent on the prompt, like Runner.run.
+    Tutor answers are served from the disk cache when possible, and concurrent
+    calls with the same agent, prompt and arguments share a single run instead
+    of each paying for their own LLM round-trip.
+    """
+    cache_key = _cache_key(agent, prompt, kwargs.get("run_config"))
+    if cache_key is not None:
+        final_output = cache.load(cache_key)
+        if final_output is not None:
+            return cache.CachedResult(final_output=final_output, last_agent=agent)
+
+    key = _inflight_key(agent, prompt, kwargs)
+    inflight = _INFLIGHT.get(key)
+    if inflight is None:
+        inflight = _InFlight(asyncio.ensure_future(_run_and_store(agent, prompt, cache_key, **kwargs)))
+        _INFLIGHT[key] = inflight
+        inflight.task.add_done_callback(lambda _: _forget(key, inflight))
+
+    # Every caller, the first one included, awaits through a shield, so
+    # cancelling one of them leaves the shared run going for the others.
+    # The run itself is cancelled only once its last waiter has left.
+    inflight.waiters += 1
+    try:
+        return await asyncio.shield(inflight.task)
+    finally:
+        inflight.waiters -= 1
+        if inflight.waiters == 0 and not inflight.task.done():
+            _forget(key, inflight)
+            inflight.task.cancel()
+
+async def _run_and_store(agent: Agent, prompt: str, cache_key: str | None, **kwargs) -> RunResult:
+    result = await bounded_run(agent, prompt, **kwargs)
+    if cache_key is not None and isinstance(result.final_output, str):
+        cache.store(cache_key, result.final_output)
+    return result
+
+def _forget(key: tuple, inflight: _InFlight) -> None:
+    """Drops the entry, unless a newer run has already replaced it."""
+    if _INFLIGHT.get(key) is inflight:
+        del _INFLIGHT[key]
@@ -0,0 +1,65 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_test.agents_registry import fast_subject, is_obvious_homework
+
+
+@pytest.mark.parametrize("prompt", [
+    "who was the first president of the united states?",
+    "Can you help me solve for x in the equation 2x + 5 = 11?",
+    "what is 3*4",
+    "what is 10 - 3?",
+    "simplify (2 + x)/4",
+])
+def test_obvious_homework_is_whitelisted(prompt):
+    assert is_obvious_homework(prompt)
+
+
+@pytest.mark.parametrize("prompt", [
+    "what is life",
+    "what is life in 2024",
+    "self-esteem tips",
+    "my 2-year-old won't sleep",
+    "call me at 555-1234",
+    "1-on-1 coaching tips",
+    "solve my marriage problems",
+])
+def test_stray_digits_and_hyphens_go_to_the_guardrail(prompt):
+    assert not is_obvious_homework(prompt)
+
+
+@pytest.mark.parametrize("prompt, subject", [
+    ("who was the first president of the united states?", "history"),
+    ("Can you help me solve for x in the equation 2x + 5 = 11?", "math"),
+    ("what is life in 2024", None),
+    ("when did the war end, 1944 + 1?", None),
+])
+def test_fast_subject(prompt, subject):
+    assert fast_subject(prompt) == subject
+
+
+def test_dispatch_sends_keyword_only_prompts_through_the_guardrail(monkeypatch):
+    from agents import InputGuardrailTripwireTriggered
+
+    from ai_test import agents_registry, runner
+
+    ran = []
+
+    async def run(agent, prompt, **kwargs):
+        ran.append(agent)
+        if agent is agents_registry.guardrail_agent:
+            verdict = agents_registry.HomeworkOutput(is_homework=False, reasoning="not homework")
+            return SimpleNamespace(final_output_as=lambda _: verdict)
+        return SimpleNamespace(final_output=prompt, last_agent=agent)
+
+    monkeypatch.setenv("AITEST_CACHE", "0")
+    monkeypatch.setattr(runner.Runner, "run", run)
+    monkeypatch.setattr(agents_registry, "get_config", lambda: None)
+
+    with pytest.raises(InputGuardrailTripwireTriggered):
+        asyncio.run(agents_registry.dispatch("recommend a good war movie"))
+
+    assert agents_registry.guardrail_agent in ran
+    assert agents_registry.history_tutor_agent not in ran
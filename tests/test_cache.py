@@ -0,0 +1,92 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_test import cache, runner
+from ai_test.agents_registry import math_tutor_agent
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.delenv("AITEST_CACHE", raising=False)
+    return tmp_path / "cache"
+
+
+def test_store_then_load_round_trips():
+    k = cache.key("gemini-2.0-flash", "Math Tutor", "1 + 1", "instr")
+    cache.store(k, "2")
+
+    assert cache.load(k) == "2"
+
+
+def test_missing_entry_is_a_miss():
+    assert cache.load(cache.key("m", "a", "p", "i")) is None
+
+
+@pytest.mark.parametrize("field", range(4))
+def test_key_changes_with_every_input(field):
+    parts = ["gemini-2.0-flash", "Math Tutor", "1 + 1", "instr"]
+    changed = list(parts)
+    changed[field] += "!"
+
+    assert cache.key(*parts) != cache.key(*changed)
+
+
+@pytest.mark.parametrize("contents", ["[]", "null", "42", "not json", '{"final_output": 1}', "{}"])
+def test_corrupt_entry_is_a_miss(cache_dir, contents):
+    k = cache.key("m", "a", "p", "i")
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f"{k}.json").write_text(contents)
+
+    assert cache.load(k) is None
+
+
+def _count_runs(monkeypatch):
+    calls = []
+
+    async def run(agent, prompt, **kwargs):
+        calls.append(prompt)
+        return SimpleNamespace(final_output=f"answer to {prompt}", last_agent=agent)
+
+    monkeypatch.setattr(runner.Runner, "run", run)
+    return calls
+
+
+CONFIG = SimpleNamespace(model=SimpleNamespace(model="gemini-2.0-flash"))
+
+
+def test_repeat_tutor_run_is_served_from_disk(monkeypatch):
+    calls = _count_runs(monkeypatch)
+
+    first = asyncio.run(runner.run_agent(math_tutor_agent, "1 + 1", run_config=CONFIG))
+    second = asyncio.run(runner.run_agent(math_tutor_agent, "1 + 1", run_config=CONFIG))
+
+    assert calls == ["1 + 1"]
+    assert isinstance(second, cache.CachedResult)
+    assert second.final_output == first.final_output
+    assert second.last_agent is math_tutor_agent
+
+
+def test_aitest_cache_0_bypasses_the_cache(monkeypatch, cache_dir):
+    monkeypatch.setenv("AITEST_CACHE", "0")
+    calls = _count_runs(monkeypatch)
+
+    for _ in range(2):
+        asyncio.run(runner.run_agent(math_tutor_agent, "1 + 1", run_config=CONFIG))
+
+    assert calls == ["1 + 1", "1 + 1"]
+    assert not cache_dir.exists()
+
+
+def test_corrupt_entry_falls_back_to_a_run(monkeypatch, cache_dir):
+    calls = _count_runs(monkeypatch)
+    k = cache.key("gemini-2.0-flash", math_tutor_agent.name, "1 + 1", math_tutor_agent.instructions)
+    cache_dir.mkdir(parents=True)
+    (cache_dir / f"{k}.json").write_text("[]")
+
+    result = asyncio.run(runner.run_agent(math_tutor_agent, "1 + 1", run_config=CONFIG))
+
+    assert calls == ["1 + 1"]
+    assert result.final_output == "answer to 1 + 1"
@@ -0,0 +1,168 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from ai_test import runner
+
+
+@pytest.fixture
+def fake_run(monkeypatch):
+    """Replaces Runner.run with a slow stub that counts its calls and cancellations."""
+    stats = SimpleNamespace(calls=0, cancelled=0)
+
+    async def run(agent, prompt, **kwargs):
+        stats.calls += 1
+        try:
+            await asyncio.sleep(0.05)
+        except asyncio.CancelledError:
+            stats.cancelled += 1
+            raise
+        return SimpleNamespace(final_output=f"{agent.name}: {prompt}", last_agent=agent)
+
+    monkeypatch.setenv("AITEST_CACHE", "0")
+    monkeypatch.setattr(runner.Runner, "run", run)
+    return stats
+
+
+AGENT = SimpleNamespace(name="Tutor")
+
+
+def test_identical_concurrent_runs_share_one_call(fake_run):
+    async def scenario():
+        return await asyncio.gather(*(runner.run_agent(AGENT, "q") for _ in range(3)))
+
+    results = asyncio.run(scenario())
+
+    assert [r.final_output for r in results] == ["Tutor: q"] * 3
+    assert fake_run.calls == 1
+    assert runner._INFLIGHT == {}
+
+
+def test_cancelling_first_caller_keeps_shared_run_for_others(fake_run):
+    async def scenario():
+        first = asyncio.create_task(runner.run_agent(AGENT, "q"))
+        second = asyncio.create_task(runner.run_agent(AGENT, "q"))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        result = await second
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return result
+
+    result = asyncio.run(scenario())
+
+    assert result.final_output == "Tutor: q"
+    assert fake_run.calls == 1
+    assert fake_run.cancelled == 0
+
+
+def test_cancelling_every_caller_cancels_the_run(fake_run):
+    async def scenario():
+        callers = [asyncio.create_task(runner.run_agent(AGENT, "q")) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        # A new caller starts a fresh run instead of joining the cancelled one
+        return await runner.run_agent(AGENT, "q")
+
+    result = asyncio.run(scenario())
+
+    assert result.final_output == "Tutor: q"
+    assert fake_run.calls == 2
+    assert fake_run.cancelled == 1
+
+
+def test_failure_reaches_every_waiter(monkeypatch):
+    async def run(agent, prompt, **kwargs):
+        await asyncio.sleep(0.01)
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(runner.Runner, "run", run)
+
+    async def scenario():
+        return await asyncio.gather(
+            runner.run_agent(AGENT, "q"), runner.run_agent(AGENT, "q"), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+
+    assert [type(r) for r in results] == [RuntimeError, RuntimeError]
+
+
+def test_max_conc_bounds_concurrent_runs(monkeypatch):
+    monkeypatch.setenv("AITEST_MAX_CONC", "2")
+    active = peak = 0
+
+    async def run(agent, prompt, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return SimpleNamespace(final_output=prompt, last_agent=agent)
+
+    monkeypatch.setattr(runner.Runner, "run", run)
+
+    async def scenario():
+        return await asyncio.gather(*(runner.run_agent(AGENT, f"q{i}") for i in range(6)))
+
+    assert len(asyncio.run(scenario())) == 6
+    assert peak == 2
+
+
+@pytest.mark.parametrize("value", ["0", "-3", "many"])
+def test_invalid_max_conc_is_rejected(monkeypatch, value):
+    monkeypatch.setenv("AITEST_MAX_CONC", value)
+
+    with pytest.raises(ValueError, match="AITEST_MAX_CONC must be a number >= 1"):
+        asyncio.run(runner.bounded_run(AGENT, "q"))
+
+
+def test_clones_with_the_same_name_are_not_coalesced(fake_run):
+    from ai_test.agents_registry import triage_agent, triage_agent_no_guardrail
+
+    assert triage_agent.name == triage_agent_no_guardrail.name
+
+    async def scenario():
+        return await asyncio.gather(
+            runner.run_agent(triage_agent, "q"),
+            runner.run_agent(triage_agent_no_guardrail, "q"),
+        )
+
+    guarded, unguarded = asyncio.run(scenario())
+
+    assert fake_run.calls == 2
+    assert guarded.last_agent is triage_agent
+    assert unguarded.last_agent is triage_agent_no_guardrail
+
+
+def test_different_run_arguments_are_not_coalesced(fake_run):
+    async def scenario():
+        return await asyncio.gather(
+            runner.run_agent(AGENT, "q", context={"user": 1}),
+            runner.run_agent(AGENT, "q", context={"user": 2}),
+        )
+
+    asyncio.run(scenario())
+
+    assert fake_run.calls == 2
+
+
+def test_limits_work_across_separate_event_loops(monkeypatch):
+    monkeypatch.setenv("AITEST_MAX_CONC", "1")
+
+    async def run(agent, prompt, **kwargs):
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(final_output=prompt, last_agent=agent)
+
+    monkeypatch.setattr(runner.Runner, "run", run)
+
+    async def scenario():
+        # Enough runs to contend on the semaphore, which binds it to the loop
+        return await asyncio.gather(*(runner.run_agent(AGENT, f"q{i}") for i in range(3)))
+
+    for _ in range(2):
+        assert len(asyncio.run(scenario())) == 3